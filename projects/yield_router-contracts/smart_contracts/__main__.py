@@ -1,28 +1,28 @@
 import dataclasses
 import importlib
 import logging
+import os
 import subprocess
 import sys
 from collections.abc import Callable
 from pathlib import Path
 from shutil import rmtree
 
-from algokit_utils.config import config
 from dotenv import load_dotenv
 
-# Set trace_all to True to capture all transactions, defaults to capturing traces only on failure
-# Learn more about using AlgoKit AVM Debugger to debug your TEAL source codes and inspect various kinds of
-# Algorand transactions in atomic groups -> https://github.com/algorandfoundation/algokit-avm-vscode-debugger
-config.configure(debug=True, trace_all=False)
+from smart_contracts._runtime import apply_profile, load_profile, telemetry
 
-# Set up logging and load environment variables.
-logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s %(levelname)-10s: %(message)s"
-)
-logger = logging.getLogger(__name__)
-logger.info("Loading .env")
+# Load environment variables first so the runtime profile can be set from .env.
 load_dotenv()
 
+# Select the runtime profile with CONTRACTS_PROFILE=dev|production (defaults to dev).
+# dev runs AlgoKit in debug mode (traces on failure, see smart_contracts/_runtime/profiles.py
+# to trace all transactions) with DEBUG logging. production skips the simulate and trace
+# overhead, logs at INFO and records per-call and per-step telemetry instead.
+profile = apply_profile(load_profile())
+logger = logging.getLogger(__name__)
+logger.info(f"Using {profile.name} runtime profile")
+
 # Determine the root path based on this file's location.
 root_path = Path(__file__).parent
 
@@ -174,7 +174,8 @@ def main(action: str, contract_name: str | None = None) -> None:
         case "build":
             for contract in filtered_contracts:
                 logger.info(f"Building app at {contract.path}")
-                build(artifact_path / contract.name, contract.path)
+                with telemetry.step("build", contract.name):
+                    build(artifact_path / contract.name, contract.path)
         case "deploy":
             for contract in filtered_contracts:
                 output_dir = artifact_path / contract.name
@@ -190,22 +191,38 @@ def main(action: str, contract_name: str | None = None) -> None:
                     raise Exception("Could not deploy app, .arc56.json file not found")
                 if contract.deploy:
                     logger.info(f"Deploying app {contract.name}")
-                    contract.deploy()
+                    with telemetry.step("deploy", contract.name):
+                        contract.deploy()
         case "all":
             for contract in filtered_contracts:
                 logger.info(f"Building app at {contract.path}")
-                build(artifact_path / contract.name, contract.path)
+                with telemetry.step("build", contract.name):
+                    build(artifact_path / contract.name, contract.path)
                 if contract.deploy:
                     logger.info(f"Deploying {contract.name}")
-                    contract.deploy()
+                    with telemetry.step("deploy", contract.name):
+                        contract.deploy()
         case _:
             logger.error(f"Unknown action: {action}")
 
 
-if __name__ == "__main__":
-    if len(sys.argv) > 2:
-        main(sys.argv[1], sys.argv[2])
-    elif len(sys.argv) > 1:
-        main(sys.argv[1])
+def export_telemetry() -> None:
+    """Writes recorded telemetry to $CONTRACTS_TELEMETRY_FILE, or logs it as JSON if unset."""
+    output = os.environ.get("CONTRACTS_TELEMETRY_FILE")
+    if output:
+        telemetry.write(Path(output))
     else:
-        main("all")
\ No newline at end of file
+        logger.info(f"Telemetry:\n{telemetry.to_json()}")
+
+
+if __name__ == "__main__":
+    try:
+        if len(sys.argv) > 2:
+            main(sys.argv[1], sys.argv[2])
+        elif len(sys.argv) > 1:
+            main(sys.argv[1])
+        else:
+            main("all")
+    finally:
+        if telemetry.enabled:
+            export_telemetry()
\ No newline at end of file
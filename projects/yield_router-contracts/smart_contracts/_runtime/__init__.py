@@ -0,0 +1,25 @@
+from smart_contracts._runtime.profiles import (
+    PROFILES,
+    RuntimeProfile,
+    apply_profile,
+    load_profile,
+)
+from smart_contracts._runtime.telemetry import (
+    CallRecord,
+    SimulateRecorder,
+    StepRecord,
+    Telemetry,
+    telemetry,
+)
+
+__all__ = [
+    "PROFILES",
+    "CallRecord",
+    "RuntimeProfile",
+    "SimulateRecorder",
+    "StepRecord",
+    "Telemetry",
+    "apply_profile",
+    "load_profile",
+    "telemetry",
+]
@@ -0,0 +1,53 @@
+import dataclasses
+import logging
+import os
+
+from algokit_utils.config import config
+
+from smart_contracts._runtime.telemetry import telemetry
+
+PROFILE_ENV_VAR = "CONTRACTS_PROFILE"
+DEFAULT_PROFILE = "dev"
+
+
+@dataclasses.dataclass(frozen=True)
+class RuntimeProfile:
+    name: str
+    debug: bool
+    trace_all: bool
+    log_level: int
+    telemetry: bool
+
+
+PROFILES: dict[str, RuntimeProfile] = {
+    # Debug mode captures traces for failed transactions; set trace_all to True to capture all of them.
+    # Learn more about using AlgoKit AVM Debugger to debug your TEAL source codes and inspect various kinds of
+    # Algorand transactions in atomic groups -> https://github.com/algorandfoundation/algokit-avm-vscode-debugger
+    "dev": RuntimeProfile(
+        name="dev", debug=True, trace_all=False, log_level=logging.DEBUG, telemetry=False
+    ),
+    # No simulate/trace overhead; per-call and per-step telemetry is recorded instead.
+    "production": RuntimeProfile(
+        name="production", debug=False, trace_all=False, log_level=logging.INFO, telemetry=True
+    ),
+}
+
+
+def load_profile(name: str | None = None) -> RuntimeProfile:
+    """Returns the named profile, falling back to $CONTRACTS_PROFILE and then to dev."""
+    name = (name or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE).lower()
+    if name not in PROFILES:
+        raise Exception(
+            f"Unknown runtime profile '{name}', expected one of: {', '.join(PROFILES)}"
+        )
+    return PROFILES[name]
+
+
+def apply_profile(profile: RuntimeProfile) -> RuntimeProfile:
+    """Configures algokit tracing, logging and telemetry for the given profile."""
+    config.configure(debug=profile.debug, trace_all=profile.trace_all)
+    logging.basicConfig(
+        level=profile.log_level, format="%(asctime)s %(levelname)-10s: %(message)s"
+    )
+    telemetry.enabled = profile.telemetry
+    return profile
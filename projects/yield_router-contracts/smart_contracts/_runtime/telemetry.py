@@ -0,0 +1,315 @@
+import contextlib
+import dataclasses
+import json
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, TypeVar
+
+from algokit_utils import AlgorandClient, AppFactoryDeployResult, SendSingleTransactionResult
+from algosdk import transaction
+from algosdk.v2client.algod import AlgodClient
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "yield_router"
+
+SendResultT = TypeVar("SendResultT", bound=SendSingleTransactionResult)
+AppClientT = TypeVar("AppClientT")
+
+
+@dataclasses.dataclass
+class CallRecord:
+    """
+    Cost of one contract method call, or of a create, update, delete or payment
+    sent while deploying. `fee` is in microAlgos; for calls sent in a packed
+    group, `seconds` is the call's share of the group's latency.
+    """
+
+    method: str
+    seconds: float
+    fee: int = 0
+    opcode_cost: int | None = None
+    box_refs: int = 0
+    tx_id: str | None = None
+    error: str | None = None
+
+
+@dataclasses.dataclass
+class StepRecord:
+    """Wall time of one build or deploy step."""
+
+    kind: str
+    name: str
+    seconds: float
+    error: str | None = None
+
+
+def transaction_fees(txns: Iterable[transaction.Transaction]) -> int:
+    return sum(txn.fee for txn in txns)
+
+
+def box_reference_count(txns: Iterable[transaction.Transaction]) -> int:
+    """Box references carried by the transactions; each grants 1KB of box I/O."""
+    return sum(
+        len(txn.boxes or [])
+        for txn in txns
+        if isinstance(txn, transaction.ApplicationCallTxn)
+    )
+
+
+class SimulateRecorder(AlgodClient):
+    """
+    Forwards every request to `algod` and keeps the last simulate response, so
+    opcode costs can be read from a simulate made for another purpose (such as
+    resource population) instead of paying for a second one.
+    """
+
+    def __init__(self, algod: AlgodClient) -> None:
+        super().__init__(algod.algod_token, algod.algod_address, algod.headers)
+        self._algod = algod
+        self.simulate_response: dict[str, Any] | None = None
+
+    def algod_request(  # type: ignore[override]
+        self,
+        method: str,
+        requrl: str,
+        params: Any = None,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        response_format: str | None = "json",
+        timeout: int | None = 30,
+    ) -> Any:
+        response = self._algod.algod_request(
+            method, requrl, params, data, headers, response_format, timeout
+        )
+        if requrl == "/transactions/simulate":
+            self.simulate_response = response
+        return response
+
+    def opcode_costs(self) -> list[int] | None:
+        """Opcode cost of each transaction in the recorded simulate, if it succeeded."""
+        if not self.simulate_response:
+            return None
+        group = self.simulate_response["txn-groups"][0]
+        if group.get("failure-message"):
+            return None
+        return [result.get("app-budget-consumed", 0) for result in group["txn-results"]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Formats a sample exactly: integral totals as integers, others at full precision."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Telemetry:
+    """
+    Lightweight recorder for contract method calls and build/deploy steps.
+
+    Nothing is recorded unless `enabled` is set, which the production runtime
+    profile does. Records are exported with `to_json` or `to_prometheus`.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.calls: list[CallRecord] = []
+        self.steps: list[StepRecord] = []
+        self._recorder: SimulateRecorder | None = None
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.steps.clear()
+
+    @contextlib.contextmanager
+    def step(self, kind: str, name: str) -> Iterator[None]:
+        """Times the enclosed build or deploy step."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        error: str | None = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            self.steps.append(StepRecord(kind, name, time.perf_counter() - started, error))
+
+    def record_call(self, record: CallRecord) -> None:
+        if self.enabled:
+            self.calls.append(record)
+
+    def instrument(self, algorand: AlgorandClient) -> AlgorandClient:
+        """
+        Returns a client whose algod requests go through a `SimulateRecorder`, so
+        `track_send` can read opcode costs from the simulate that algokit makes to
+        populate resources. Call it before loading accounts, which aren't carried over.
+        """
+        if not self.enabled:
+            return algorand
+        kmd = None
+        with contextlib.suppress(ValueError):
+            kmd = algorand.client.kmd
+        self._recorder = SimulateRecorder(algorand.client.algod)
+        return AlgorandClient.from_clients(
+            algod=self._recorder, indexer=algorand.client.indexer_if_present, kmd=kmd
+        )
+
+    def track_send(self, method: str, send: Callable[[], SendResultT]) -> SendResultT:
+        """
+        Runs a typed client `send` call and records its wall time, fees, box
+        references and, for sends through an `instrument`ed client, opcode cost.
+        """
+        if not self.enabled:
+            return send()
+        self._forget_simulate()
+        started = time.perf_counter()
+        try:
+            result = send()
+        except Exception as e:
+            self.record_call(CallRecord(method, time.perf_counter() - started, error=str(e)))
+            raise
+        self._record_result(method, time.perf_counter() - started, result)
+        return result
+
+    def track_deploy(
+        self, deploy: Callable[[], tuple[AppClientT, AppFactoryDeployResult]]
+    ) -> tuple[AppClientT, AppFactoryDeployResult]:
+        """
+        Runs a typed factory `deploy` call and records each create, update or
+        delete it sent, sharing the deploy's wall time between them.
+        """
+        if not self.enabled:
+            return deploy()
+        self._forget_simulate()
+        started = time.perf_counter()
+        try:
+            app_client, deployed = deploy()
+        except Exception as e:
+            self.record_call(CallRecord("deploy", time.perf_counter() - started, error=str(e)))
+            raise
+        seconds = time.perf_counter() - started
+        sent = [
+            (operation, result)
+            for operation, result in [
+                ("create", deployed.create_result),
+                ("update", deployed.update_result),
+                ("delete", deployed.delete_result),
+            ]
+            if result is not None
+        ]
+        for operation, result in sent:
+            self._record_result(operation, seconds / len(sent), result)
+        return app_client, deployed
+
+    def _forget_simulate(self) -> None:
+        if self._recorder:
+            self._recorder.simulate_response = None
+
+    def _record_result(self, method: str, seconds: float, result: SendSingleTransactionResult) -> None:
+        txns = [wrapper.raw for wrapper in result.transactions]
+        self.record_call(
+            CallRecord(
+                method,
+                seconds,
+                fee=transaction_fees(txns),
+                opcode_cost=self._opcode_cost(result),
+                box_refs=box_reference_count(txns),
+                tx_id=result.tx_id,
+            )
+        )
+
+    def _opcode_cost(self, result: SendSingleTransactionResult) -> int | None:
+        """Opcode cost of the result's transactions, read from the simulate of their group."""
+        costs = self._recorder.opcode_costs() if self._recorder else None
+        if costs is None or len(costs) != len(result.tx_ids):
+            return None
+        return sum(costs[result.tx_ids.index(wrapper.raw.get_txid())] for wrapper in result.transactions)
+
+    # ----------------------------- export ----------------------------- #
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "calls": [dataclasses.asdict(record) for record in self.calls],
+                "steps": [dataclasses.asdict(record) for record in self.steps],
+            },
+            indent=2,
+        )
+
+    def to_prometheus(self) -> str:
+        calls: dict[tuple[str, str], int] = defaultdict(int)
+        totals: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for record in self.calls:
+            calls[(record.method, "error" if record.error else "ok")] += 1
+            method_totals = totals[record.method]
+            method_totals["seconds"] += record.seconds
+            method_totals["fee"] += record.fee
+            method_totals["box_refs"] += record.box_refs
+            if record.opcode_cost is not None:
+                method_totals["opcode_cost"] += record.opcode_cost
+        steps: dict[tuple[str, str, str], float] = defaultdict(float)
+        for step in self.steps:
+            steps[(step.kind, step.name, "error" if step.error else "ok")] += step.seconds
+
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            lines.extend(
+                f"{METRIC_PREFIX}_{name}{labels} {_format_value(value)}" for labels, value in samples
+            )
+
+        metric(
+            "calls_total",
+            "counter",
+            "Contract method calls by outcome.",
+            [(_labels(method=m, status=s), n) for (m, s), n in sorted(calls.items())],
+        )
+        for key, name, help_text in [
+            ("seconds", "call_seconds_total", "Wall time spent in contract method calls."),
+            ("fee", "call_fees_microalgos_total", "Transaction fees paid by contract method calls."),
+            ("opcode_cost", "call_opcode_cost_total", "Opcode budget consumed where it was measured."),
+            ("box_refs", "call_box_refs_total", "Box references carried by contract method calls."),
+        ]:
+            metric(
+                name,
+                "counter",
+                help_text,
+                [
+                    (_labels(method=m), values[key])
+                    for m, values in sorted(totals.items())
+                    if key in values
+                ],
+            )
+        metric(
+            "step_seconds_total",
+            "counter",
+            "Wall time spent in build and deploy steps.",
+            [(_labels(kind=k, name=n, status=s), v) for (k, n, s), v in sorted(steps.items())],
+        )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """Writes Prometheus text for .prom/.txt paths and JSON otherwise."""
+        text = self.to_prometheus() if path.suffix in (".prom", ".txt") else self.to_json()
+        path.write_text(text)
+        logger.info(
+            f"Wrote telemetry for {len(self.calls)} calls and {len(self.steps)} steps to {path}"
+        )
+
+
+# Process-wide recorder, enabled by the production runtime profile.
+telemetry = Telemetry()
@@ -0,0 +1,4 @@
+from smart_contracts._submit.local_node import AppHandler, LocalAppCall, LocalNode
+from smart_contracts._submit.submitter import BulkSubmitter, CallResult
+
+__all__ = ["AppHandler", "BulkSubmitter", "CallResult", "LocalAppCall", "LocalNode"]
@@ -0,0 +1,138 @@
+"""
+Throughput benchmark for `BulkSubmitter` against the in-memory `LocalNode`.
+
+Submits `LeaderboardContract.update_player_stats` calls for distinct players,
+each touching its own `stats_` box, and reports calls per second for bulk
+submission next to the one-call-per-transaction, wait-for-each baseline.
+
+    poetry run python -m smart_contracts._submit.benchmark --calls 2000
+"""
+
+import argparse
+import dataclasses
+import logging
+import time
+from pathlib import Path
+
+from algokit_utils import AlgorandClient, AppCallMethodCallParams
+from algosdk import account, encoding, transaction
+from algosdk.abi import Method
+
+from smart_contracts._runtime import telemetry
+from smart_contracts._submit.local_node import AppHandler, LocalAppCall, LocalNode
+from smart_contracts._submit.submitter import BulkSubmitter
+
+logger = logging.getLogger(__name__)
+
+APP_ID = 1001
+UPDATE_PLAYER_STATS = Method.from_signature(
+    "update_player_stats(account,uint64,uint64,uint64)void"
+)
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    label: str
+    calls: int
+    confirmed: int
+    seconds: float
+
+    @property
+    def calls_per_second(self) -> float:
+        return self.confirmed / self.seconds if self.seconds else 0.0
+
+
+def leaderboard_handler(reject_every: int = 0) -> AppHandler:
+    """Mimics `update_player_stats`: reads and writes the player's `stats_` box."""
+
+    def handle(txn: transaction.ApplicationCallTxn) -> LocalAppCall:
+        account_index = txn.app_args[1][0]
+        player = txn.sender if account_index == 0 else txn.accounts[account_index - 1]
+        if reject_every and int.from_bytes(txn.app_args[2], "big") % reject_every == 0:
+            raise Exception("assert failed")
+        return LocalAppCall(
+            boxes=[(txn.index, b"stats_" + encoding.decode_address(player))],
+            opcode_cost=97,
+        )
+
+    return handle
+
+
+def _calls(sender: str, count: int) -> list[AppCallMethodCallParams]:
+    return [
+        AppCallMethodCallParams(
+            sender=sender,
+            app_id=APP_ID,
+            method=UPDATE_PLAYER_STATS,
+            args=[account.generate_account()[1], i + 1, 0, 1],
+        )
+        for i in range(count)
+    ]
+
+
+def run(
+    label: str,
+    calls: int,
+    round_time: float,
+    reject_every: int = 0,
+    **submitter_options: int,
+) -> BenchmarkResult:
+    algorand = AlgorandClient.from_clients(
+        algod=LocalNode(leaderboard_handler(reject_every), round_time=round_time)
+    )
+    sender = algorand.account.random()
+    submitter = BulkSubmitter(algorand, **submitter_options)
+    params = _calls(sender.address, calls)
+
+    started = time.perf_counter()
+    results = submitter.submit(params)
+    seconds = time.perf_counter() - started
+
+    for result in results:
+        if not result.ok:
+            logger.debug(f"Call {result.index} failed: {result.error}")
+    return BenchmarkResult(label, calls, sum(r.ok for r in results), seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--baseline-calls", type=int, default=20)
+    parser.add_argument("--round-time", type=float, default=0.25)
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--reject-every", type=int, default=0)
+    parser.add_argument(
+        "--telemetry", type=Path, help="record per-call telemetry to this .json or .prom file"
+    )
+    args = parser.parse_args()
+    telemetry.enabled = args.telemetry is not None
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-10s: %(message)s")
+    benchmarks = [
+        run(
+            "sequential",
+            args.baseline_calls,
+            args.round_time,
+            args.reject_every,
+            max_group_size=1,
+            max_in_flight=1,
+        ),
+        run(
+            "bulk",
+            args.calls,
+            args.round_time,
+            args.reject_every,
+            max_in_flight=args.max_in_flight,
+        ),
+    ]
+    for result in benchmarks:
+        print(
+            f"{result.label:<12} {result.confirmed:>6}/{result.calls:<6} calls "
+            f"in {result.seconds:8.2f}s  {result.calls_per_second:10.1f} calls/s"
+        )
+    if args.telemetry:
+        telemetry.write(args.telemetry)
+
+
+if __name__ == "__main__":
+    main()
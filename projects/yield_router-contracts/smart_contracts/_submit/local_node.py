@@ -0,0 +1,245 @@
+import base64
+import dataclasses
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import msgpack  # type: ignore[import-untyped]
+from algosdk import transaction
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+
+
+@dataclasses.dataclass
+class LocalAppCall:
+    """The effect of an application call as reported by an `AppHandler`."""
+
+    logs: list[bytes] = dataclasses.field(default_factory=list)
+    boxes: list[tuple[int, bytes]] = dataclasses.field(default_factory=list)
+    opcode_cost: int = 0
+
+
+# Executes an application call on the stand-in node. Raise to reject the call.
+AppHandler = Callable[[transaction.ApplicationCallTxn], LocalAppCall]
+
+
+@dataclasses.dataclass
+class _PooledTxn:
+    signed: dict[str, Any]
+    confirmed_round: int
+    logs: list[bytes]
+
+
+def _transaction(signed: dict[str, Any]) -> transaction.Transaction:
+    """Extracts the transaction from a decoded, possibly unsigned, signed transaction."""
+    return transaction.Transaction.undictify(signed["txn"])
+
+
+class LocalNode(AlgodClient):
+    """
+    In-memory stand-in for algod that answers the REST calls used by the
+    submission engine (params, simulate, send, pending info and status).
+
+    No AVM runs here: application calls are handed to `app_handler`, and the
+    boxes it reports must be covered by the group's box references, exactly as
+    a real node would enforce. Rounds advance every `round_time` seconds and
+    accepted groups confirm in the next round, which must fall inside every
+    transaction's validity window.
+
+    With `round_time=None` the clock is manual, so tests don't depend on wall
+    time: rounds only move on `advance()`, or when a client waits for a block
+    after the current round, which makes that block at once (as LocalNet's dev
+    mode does).
+    """
+
+    def __init__(
+        self,
+        app_handler: AppHandler | None = None,
+        round_time: float | None = 0.1,
+        genesis_id: str = "localnode-v1",
+        min_fee: int = 1000,
+    ) -> None:
+        super().__init__("", "http://localnode")
+        if round_time is not None and round_time <= 0:
+            raise ValueError("round_time must be positive")
+        self.app_handler = app_handler or (lambda _txn: LocalAppCall())
+        self.round_time = round_time
+        self.genesis_id = genesis_id
+        self.genesis_hash = base64.b64encode(bytes(32)).decode()
+        self.min_fee = min_fee
+        self._started = time.monotonic()
+        self._round = 1
+        self._lock = threading.Lock()
+        self._pool: dict[str, _PooledTxn] = {}
+
+    # ----------------------------- rounds ----------------------------- #
+
+    def current_round(self) -> int:
+        if self.round_time is None:
+            return self._round
+        return 1 + int((time.monotonic() - self._started) / self.round_time)
+
+    def advance(self, rounds: int = 1) -> int:
+        """Moves a manual clock forward and returns the new round."""
+        if self.round_time is not None:
+            raise Exception("Only a LocalNode with round_time=None can be advanced by hand")
+        with self._lock:
+            self._round += rounds
+            return self._round
+
+    def _wait_for_round(self, round_num: int) -> None:
+        if self.round_time is None:
+            with self._lock:
+                self._round = max(self._round, round_num)
+            return
+        target = self._started + (round_num - 1) * self.round_time
+        delay = target - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    # ---------------------------- transport --------------------------- #
+
+    def algod_request(  # type: ignore[override]
+        self,
+        method: str,
+        requrl: str,
+        params: Any = None,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        response_format: str | None = "json",
+        timeout: int | None = 30,
+    ) -> Any:
+        """Routes a request to the in-memory handlers instead of HTTP."""
+        if method == "GET" and requrl == "/transactions/params":
+            return self._suggested_params()
+        if method == "GET" and requrl == "/status":
+            return {"last-round": self.current_round()}
+        if method == "GET" and requrl.startswith("/status/wait-for-block-after/"):
+            self._wait_for_round(int(requrl.rsplit("/", 1)[1]) + 1)
+            return {"last-round": self.current_round()}
+        if method == "GET" and requrl.startswith("/transactions/pending/"):
+            return self._pending_info(requrl.rsplit("/", 1)[1])
+        if method == "POST" and requrl == "/transactions/simulate":
+            return self._simulate(msgpack.unpackb(data, raw=False, strict_map_key=False))
+        if method == "POST" and requrl == "/transactions":
+            return self._send(data or b"")
+        raise AlgodHTTPError(f"{method} {requrl} is not supported by LocalNode", 404)
+
+    def _suggested_params(self) -> dict[str, Any]:
+        return {
+            "fee": 0,
+            "min-fee": self.min_fee,
+            "last-round": self.current_round(),
+            "genesis-hash": self.genesis_hash,
+            "genesis-id": self.genesis_id,
+            "consensus-version": "future",
+        }
+
+    # ---------------------------- execution --------------------------- #
+
+    def _execute(self, txn: transaction.Transaction) -> LocalAppCall:
+        if isinstance(txn, transaction.ApplicationCallTxn):
+            return self.app_handler(txn)
+        return LocalAppCall()
+
+    @staticmethod
+    def _box_references(txns: list[transaction.Transaction]) -> set[tuple[int, bytes]]:
+        refs: set[tuple[int, bytes]] = set()
+        for txn in txns:
+            if not isinstance(txn, transaction.ApplicationCallTxn):
+                continue
+            for box in txn.boxes or []:
+                app_id = txn.index if box.app_index == 0 else txn.foreign_apps[box.app_index - 1]
+                refs.add((app_id, box.name))
+        return refs
+
+    def _simulate(self, request: dict[str, Any]) -> dict[str, Any]:
+        txns = [_transaction(signed) for signed in request["txn-groups"][0]["txns"]]
+        available = self._box_references(txns)
+        unnamed: set[tuple[int, bytes]] = set()
+        results: list[dict[str, Any]] = []
+        group: dict[str, Any] = {"txn-results": results}
+        for i, txn in enumerate(txns):
+            # Like algod, report every transaction in the group even after a failure.
+            result: dict[str, Any] = {"txn-result": {"txn": {"txn": txn.dictify()}}}
+            results.append(result)
+            if "failed-at" in group:
+                continue
+            try:
+                effect = self._execute(txn)
+            except Exception as e:
+                group["failure-message"] = f"transaction {txn.get_txid()}: logic eval error: {e}"
+                group["failed-at"] = [i]
+                continue
+            missing = {box for box in effect.boxes if box not in available}
+            if missing and not request.get("allow-unnamed-resources"):
+                group["failure-message"] = (
+                    f"transaction {txn.get_txid()}: logic eval error: invalid Box reference"
+                )
+                group["failed-at"] = [i]
+                continue
+            unnamed |= missing
+            result["txn-result"]["logs"] = [base64.b64encode(log).decode() for log in effect.logs]
+            result["app-budget-consumed"] = effect.opcode_cost
+        if unnamed:
+            group["unnamed-resources-accessed"] = {
+                "boxes": [
+                    {"app": app_id, "name": base64.b64encode(name).decode()}
+                    for app_id, name in sorted(unnamed)
+                ]
+            }
+        return {"version": 2, "last-round": self.current_round(), "txn-groups": [group]}
+
+    def _send(self, data: bytes) -> dict[str, Any]:
+        unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+        unpacker.feed(data)
+        signed_txns = list(unpacker)
+        txns = [_transaction(signed) for signed in signed_txns]
+        if not txns:
+            raise AlgodHTTPError("empty transaction group", 400)
+        if len(txns) > 1 and (txns[0].group is None or any(t.group != txns[0].group for t in txns)):
+            raise AlgodHTTPError("transaction group is not properly formed", 400)
+        confirmed_round = self.current_round() + 1
+        for txn in txns:
+            if not txn.first_valid_round <= confirmed_round <= txn.last_valid_round:
+                raise AlgodHTTPError(
+                    f"TransactionPool.Remember: txn dead: round {confirmed_round} outside of "
+                    f"{txn.first_valid_round}--{txn.last_valid_round}",
+                    400,
+                )
+        available = self._box_references(txns)
+        logs: list[list[bytes]] = []
+        for txn in txns:
+            try:
+                effect = self._execute(txn)
+            except Exception as e:
+                raise AlgodHTTPError(
+                    f"TransactionPool.Remember: transaction {txn.get_txid()}: logic eval error: {e}", 400
+                ) from e
+            if any(box not in available for box in effect.boxes):
+                raise AlgodHTTPError(
+                    f"TransactionPool.Remember: transaction {txn.get_txid()}: "
+                    "logic eval error: invalid Box reference",
+                    400,
+                )
+            logs.append(effect.logs)
+        with self._lock:
+            for signed, txn, txn_logs in zip(signed_txns, txns, logs):
+                self._pool[txn.get_txid()] = _PooledTxn(signed, confirmed_round, txn_logs)
+        return {"txId": txns[0].get_txid()}
+
+    def _pending_info(self, tx_id: str) -> dict[str, Any]:
+        with self._lock:
+            pooled = self._pool.get(tx_id)
+        if pooled is None:
+            raise AlgodHTTPError("txn does not exist", 404)
+        info: dict[str, Any] = {
+            "pool-error": "",
+            "txn": pooled.signed,
+            "confirmed-round": 0,
+        }
+        if pooled.confirmed_round <= self.current_round():
+            info["confirmed-round"] = pooled.confirmed_round
+            info["logs"] = [base64.b64encode(log).decode() for log in pooled.logs]
+        return info
@@ -0,0 +1,512 @@
+import asyncio
+import copy
+import dataclasses
+import itertools
+import logging
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from algokit_utils import AlgorandClient, AppCallMethodCallParams
+from algokit_utils.transactions.transaction_composer import (
+    TransactionComposer,
+    populate_app_call_resources,
+)
+from algosdk.abi import Method
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    TransactionSigner,
+    TransactionWithSigner,
+)
+from algosdk.constants import TX_GROUP_LIMIT
+from algosdk.error import AlgodHTTPError
+from algosdk.transaction import GenericSignedTransaction, SuggestedParams
+from algosdk.v2client.algod import AlgodClient
+
+from smart_contracts._runtime.telemetry import (
+    CallRecord,
+    SimulateRecorder,
+    Telemetry,
+    box_reference_count,
+    telemetry as default_telemetry,
+    transaction_fees,
+)
+
+logger = logging.getLogger(__name__)
+
+# Times a group rejected as dead (past its validity window) is restamped and sent.
+SEND_ATTEMPTS = 3
+
+
+@dataclasses.dataclass
+class CallResult:
+    """Outcome of a single ABI call submitted through `BulkSubmitter`."""
+
+    index: int
+    method: str
+    tx_id: str | None = None
+    confirmed_round: int | None = None
+    return_value: Any = None
+    tx_info: dict[str, Any] | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass
+class _Call:
+    index: int
+    txns: list[TransactionWithSigner]
+    methods: dict[int, Method]
+
+    @property
+    def method_offset(self) -> int:
+        # The call's own app call comes after any transaction arguments.
+        return max(self.methods)
+
+
+@dataclasses.dataclass
+class _Group:
+    calls: list[_Call]
+    atc: AtomicTransactionComposer
+    opcode_costs: list[int] | None = None
+
+    def method_positions(self) -> list[tuple[_Call, int]]:
+        return [(call, offset + call.method_offset) for call, offset in self.spans()]
+
+    def spans(self) -> list[tuple[_Call, int]]:
+        """Pairs each call with the group index of its first transaction."""
+        spans = []
+        offset = 0
+        for call in self.calls:
+            spans.append((call, offset))
+            offset += len(call.txns)
+        return spans
+
+
+class _ConfirmationWatcher:
+    """
+    Confirms every in-flight transaction with a single status wait per round.
+
+    A transaction is only reported as unconfirmed once a round past its
+    `last_valid_round` has been observed, after which algod can no longer
+    accept it.
+    """
+
+    def __init__(self, algod: AlgodClient) -> None:
+        self._algod = algod
+        # tx_id -> (future, last valid round)
+        self._waiting: dict[str, tuple[asyncio.Future[dict[str, Any]], int]] = {}
+        self._wakeup = asyncio.Event()
+        self._last_round = 0
+        self._error: Exception | None = None
+
+    def watch(self, tx_id: str, last_valid_round: int) -> "asyncio.Future[dict[str, Any]]":
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        if self._error is not None:
+            future.set_exception(self._error)
+            return future
+        self._waiting[tx_id] = (future, last_valid_round)
+        self._wakeup.set()
+        return future
+
+    async def run(self) -> None:
+        try:
+            await self._poll()
+        except Exception as e:
+            self._error = Exception(f"Confirmation watcher stopped: {e}")
+            for future, _ in self._waiting.values():
+                if not future.done():
+                    future.set_exception(self._error)
+            self._waiting.clear()
+
+    async def _poll(self) -> None:
+        while True:
+            if not self._waiting:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                # Rounds kept moving while idle, so don't judge new arrivals by a stale round.
+                status = await asyncio.to_thread(self._algod.status)
+                self._last_round = status["last-round"]
+            tx_ids = list(self._waiting)
+            infos = await asyncio.gather(
+                *(asyncio.to_thread(self._algod.pending_transaction_info, tx_id) for tx_id in tx_ids),
+                return_exceptions=True,
+            )
+            for tx_id, info in zip(tx_ids, infos):
+                future, last_valid_round = self._waiting[tx_id]
+                if isinstance(info, BaseException):
+                    outcome: dict[str, Any] | Exception = Exception(
+                        f"Could not confirm transaction {tx_id}: {info}"
+                    )
+                elif info.get("confirmed-round", 0) > 0:
+                    outcome = info
+                elif info.get("pool-error"):
+                    outcome = Exception(f"Transaction {tx_id} was rejected: {info['pool-error']}")
+                elif self._last_round > last_valid_round:
+                    outcome = Exception(
+                        f"Transaction {tx_id} not confirmed by its last valid round {last_valid_round}"
+                    )
+                else:
+                    continue
+                del self._waiting[tx_id]
+                if future.done():
+                    continue
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+            if self._waiting:
+                status = await asyncio.to_thread(self._algod.status_after_block, self._last_round)
+                self._last_round = status["last-round"]
+
+
+class BulkSubmitter:
+    """
+    Submits many independent ABI calls as packed atomic groups.
+
+    Calls are the `AppCallMethodCallParams` produced by the generated typed
+    clients (`app_client.params.<method>(...)`). They are packed into groups of
+    up to `max_group_size` transactions, box and other references are filled in
+    from a simulate of each group, every wave of groups is signed in bulk (one
+    `sign_transactions` call per signer) and up to `max_in_flight` groups are
+    kept pending at once while a single watcher confirms them round by round.
+    Transactions are built `wave_size` calls at a time (at most what fits in
+    flight). Their validity window is set from fresh suggested params just
+    before each wave is signed, so time spent simulating doesn't count against
+    it, and a group that algod still rejects as dead is restamped, re-signed
+    and sent again.
+
+    Packing makes unrelated calls atomic with each other, so a group that fails
+    simulation is split in half and retried until the failing call is isolated;
+    only that call is reported as failed, and the calls that survive are packed
+    into full groups again.
+
+    When `telemetry` (by default the process-wide recorder) is enabled, each
+    call's share of its group's latency, fees, box references and opcode cost
+    are recorded; the cost is read from the simulate that populates resources,
+    so it is only known when `populate_resources` is on.
+    """
+
+    def __init__(
+        self,
+        algorand: AlgorandClient,
+        *,
+        max_group_size: int = TX_GROUP_LIMIT,
+        max_in_flight: int = 64,
+        wave_size: int = 256,
+        populate_resources: bool = True,
+        telemetry: Telemetry | None = None,
+    ) -> None:
+        if not 1 <= max_group_size <= TX_GROUP_LIMIT:
+            raise ValueError(f"max_group_size must be between 1 and {TX_GROUP_LIMIT}")
+        self.algorand = algorand
+        self.max_group_size = max_group_size
+        self.max_in_flight = max_in_flight
+        self.wave_size = wave_size
+        self.populate_resources = populate_resources
+        self.telemetry = telemetry if telemetry is not None else default_telemetry
+
+    @property
+    def _algod(self) -> AlgodClient:
+        return self.algorand.client.algod
+
+    def submit(self, calls: Iterable[AppCallMethodCallParams]) -> list[CallResult]:
+        """Submits the calls and blocks until every one is confirmed or has failed."""
+        return asyncio.run(self.submit_async(calls))
+
+    async def submit_async(self, calls: Iterable[AppCallMethodCallParams]) -> list[CallResult]:
+        """Submits the calls and returns one `CallResult` per call, in input order."""
+        results: list[CallResult] = []
+        remaining = iter(calls)
+
+        watcher = _ConfirmationWatcher(self._algod)
+        watcher_task = asyncio.create_task(watcher.run())
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        confirmations: list[asyncio.Task[None]] = []
+        records: dict[int, CallRecord] = {}
+        # A wave never holds more than can be in flight at once, so no group waits
+        # behind a whole wave of confirmations before it is sent.
+        wave_size = min(self.wave_size, self.max_in_flight * self.max_group_size)
+        try:
+            while batch := list(itertools.islice(remaining, wave_size)):
+                suggested_params = await asyncio.to_thread(self._algod.suggested_params)
+                wave: list[_Call] = []
+                for params in batch:
+                    index = len(results)
+                    results.append(CallResult(index=index, method=params.method.name))
+                    try:
+                        wave.append(self._build_call(index, params, suggested_params))
+                    except Exception as e:
+                        results[index].error = e
+                ready = await self._prepare(wave, results)
+                # The validity window starts when the wave is signed, not when it was built.
+                suggested_params = await asyncio.to_thread(self._algod.suggested_params)
+                ready = [self._restamp(group, suggested_params) for group in ready]
+                for group, signed in self._sign(ready, results):
+                    await in_flight.acquire()
+                    confirmations.append(
+                        asyncio.create_task(
+                            self._send_and_confirm(group, signed, watcher, in_flight, results, records)
+                        )
+                    )
+            await asyncio.gather(*confirmations)
+        finally:
+            watcher_task.cancel()
+
+        for result in results:
+            record = records.get(result.index) or CallRecord(result.method, 0.0)
+            record.error = None if result.ok else str(result.error)
+            self.telemetry.record_call(record)
+
+        failed = sum(not result.ok for result in results)
+        logger.info(
+            f"Submitted {len(results)} calls in {len(confirmations)} groups: "
+            f"{len(results) - failed} confirmed, {failed} failed"
+        )
+        return results
+
+    # ---------------------------- packing ----------------------------- #
+
+    def _build_call(
+        self, index: int, params: AppCallMethodCallParams, suggested_params: SuggestedParams
+    ) -> _Call:
+        composer = TransactionComposer(
+            algod=self._algod,
+            get_signer=self.algorand.account.get_signer,
+            get_suggested_params=lambda: copy.deepcopy(suggested_params),
+        )
+        built = composer.add_app_call_method_call(params).build_transactions()
+        txns = [
+            TransactionWithSigner(
+                txn,
+                built.signers.get(i) or self.algorand.account.get_signer(txn.sender),
+            )
+            for i, txn in enumerate(built.transactions)
+        ]
+        if len(txns) > self.max_group_size:
+            raise ValueError(
+                f"Call to {params.method.name} needs {len(txns)} transactions, "
+                f"more than the group size of {self.max_group_size}"
+            )
+        return _Call(index=index, txns=txns, methods=built.method_calls)
+
+    def _pack(self, calls: list[_Call]) -> list[list[_Call]]:
+        groups: list[list[_Call]] = []
+        size = self.max_group_size
+        for call in calls:
+            if size + len(call.txns) > self.max_group_size:
+                groups.append([])
+                size = 0
+            groups[-1].append(call)
+            size += len(call.txns)
+        return groups
+
+    @staticmethod
+    def _compose(calls: list[_Call]) -> AtomicTransactionComposer:
+        atc = AtomicTransactionComposer()
+        offset = 0
+        for call in calls:
+            for tws in call.txns:
+                txn = copy.deepcopy(tws.txn)
+                txn.group = None
+                atc.add_transaction(TransactionWithSigner(txn, tws.signer))
+            atc.method_dict.update({offset + i: method for i, method in call.methods.items()})
+            offset += len(call.txns)
+        return atc
+
+    async def _prepare(self, wave: list[_Call], results: list[CallResult]) -> list[_Group]:
+        """Packs and populates a wave, repacking the calls that survive a failed group."""
+        packed = self._pack(wave)
+        attempts = await asyncio.gather(*(self._populate(calls) for calls in packed))
+        ready = [group for group in attempts if isinstance(group, _Group)]
+        failed = [
+            (calls, error) for calls, error in zip(packed, attempts) if isinstance(error, Exception)
+        ]
+        if not failed:
+            return ready
+        isolated = await asyncio.gather(
+            *(self._split(calls, results, error) for calls, error in failed)
+        )
+        split = [group for groups in isolated for group in groups]
+        survivors = sorted(
+            (call for group in split for call in group.calls), key=lambda call: call.index
+        )
+        repacked_calls = self._pack(survivors)
+        if len(repacked_calls) >= len(split):
+            return ready + split
+        repacked = await asyncio.gather(*(self._split(calls, results) for calls in repacked_calls))
+        return ready + [group for groups in repacked for group in groups]
+
+    async def _populate(self, calls: list[_Call]) -> "_Group | Exception":
+        atc = self._compose(calls)
+        if not self.populate_resources:
+            return _Group(calls, atc)
+        # With telemetry on, opcode costs are read from the population simulate.
+        algod = SimulateRecorder(self._algod) if self.telemetry.enabled else self._algod
+        try:
+            atc = await asyncio.to_thread(populate_app_call_resources, atc, algod)
+        except Exception as e:
+            return e
+        group = _Group(calls, atc)
+        if isinstance(algod, SimulateRecorder):
+            group.opcode_costs = algod.opcode_costs()
+        return group
+
+    async def _split(
+        self, calls: list[_Call], results: list[CallResult], error: Exception | None = None
+    ) -> list[_Group]:
+        """
+        Halves a failing group until each failing call is on its own. `error` is
+        given when the group is already known to fail, so it isn't simulated again.
+        """
+        if error is None:
+            group = await self._populate(calls)
+            if isinstance(group, _Group):
+                return [group]
+            error = group
+        if len(calls) == 1:
+            self._fail(calls, error, results)
+            return []
+        middle = len(calls) // 2
+        left, right = await asyncio.gather(
+            self._split(calls[:middle], results), self._split(calls[middle:], results)
+        )
+        return left + right
+
+    # ------------------------ signing & sending ----------------------- #
+
+    @staticmethod
+    def _restamp(group: _Group, suggested_params: SuggestedParams) -> _Group:
+        """Moves the group's validity window to start now, keeping its length."""
+        atc = AtomicTransactionComposer()
+        for tws in group.atc.txn_list:
+            txn = tws.txn
+            txn.group = None
+            txn.last_valid_round = suggested_params.first + txn.last_valid_round - txn.first_valid_round
+            txn.first_valid_round = suggested_params.first
+            atc.add_transaction(TransactionWithSigner(txn, tws.signer))
+        atc.method_dict = dict(group.atc.method_dict)
+        return dataclasses.replace(group, atc=atc)
+
+    def _sign(
+        self, groups: list[_Group], results: list[CallResult]
+    ) -> list[tuple[_Group, list[GenericSignedTransaction]]]:
+        txns = []
+        owners: list[int] = []
+        by_signer: dict[TransactionSigner, list[int]] = {}
+        for position, group in enumerate(groups):
+            for tws in group.atc.build_group():
+                by_signer.setdefault(tws.signer, []).append(len(txns))
+                txns.append(tws.txn)
+                owners.append(position)
+
+        signed: list[GenericSignedTransaction | None] = [None] * len(txns)
+        failed: set[int] = set()
+        for signer, indexes in by_signer.items():
+            try:
+                for i, stxn in zip(indexes, signer.sign_transactions(txns, indexes)):
+                    signed[i] = stxn
+            except Exception as e:
+                for position in {owners[i] for i in indexes} - failed:
+                    self._fail(groups[position].calls, e, results)
+                    failed.add(position)
+
+        batches: list[list[GenericSignedTransaction]] = [[] for _ in groups]
+        for i, stxn in enumerate(signed):
+            if stxn is not None:
+                batches[owners[i]].append(stxn)
+        return [(group, batches[p]) for p, group in enumerate(groups) if p not in failed]
+
+    async def _send_and_confirm(
+        self,
+        group: _Group,
+        signed: list[GenericSignedTransaction],
+        watcher: _ConfirmationWatcher,
+        in_flight: asyncio.Semaphore,
+        results: list[CallResult],
+        records: dict[int, CallRecord],
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            sent = await self._send(group, signed, results)
+            if sent is None:
+                return
+            group = sent
+            positions = group.method_positions()
+            confirmed = await watcher.watch(
+                group.atc.tx_ids[positions[0][1]],
+                min(tws.txn.last_valid_round for tws in group.atc.txn_list),
+            )
+            # The watcher already fetched the first call's info; only the rest are looked up.
+            infos = [
+                confirmed,
+                *await asyncio.gather(
+                    *(
+                        asyncio.to_thread(self._algod.pending_transaction_info, group.atc.tx_ids[i])
+                        for _, i in positions[1:]
+                    )
+                ),
+            ]
+        except Exception as e:
+            self._fail(group.calls, e, results)
+            return
+        finally:
+            in_flight.release()
+            if self.telemetry.enabled:
+                self._measure(group, time.perf_counter() - started, records)
+
+        for (call, i), info in zip(positions, infos):
+            abi_result = group.atc.parse_result(group.atc.method_dict[i], group.atc.tx_ids[i], info)
+            result = results[call.index]
+            result.tx_id = abi_result.tx_id
+            result.confirmed_round = confirmed["confirmed-round"]
+            result.return_value = abi_result.return_value
+            result.tx_info = info
+            result.error = abi_result.decode_error
+
+    async def _send(
+        self, group: _Group, signed: list[GenericSignedTransaction], results: list[CallResult]
+    ) -> _Group | None:
+        """
+        Sends a signed group. If algod rejects it as dead, it is restamped and
+        re-signed and sent again; returns the group as sent, or None if it could
+        not be re-signed.
+        """
+        for attempt in range(1, SEND_ATTEMPTS + 1):
+            try:
+                await asyncio.to_thread(self._algod.send_transactions, signed)
+                return group
+            except AlgodHTTPError as e:
+                if "txn dead" not in str(e) or attempt == SEND_ATTEMPTS:
+                    raise
+                logger.debug(f"Resending a group of {len(group.calls)} calls that died: {e}")
+            suggested_params = await asyncio.to_thread(self._algod.suggested_params)
+            resigned = self._sign([self._restamp(group, suggested_params)], results)
+            if not resigned:
+                return None
+            group, signed = resigned[0]
+        return group
+
+    @staticmethod
+    def _measure(group: _Group, seconds: float, records: dict[int, CallRecord]) -> None:
+        txns = [tws.txn for tws in group.atc.txn_list]
+        # Calls share their group's send-to-confirm time, so it is counted once per group.
+        share = seconds / len(group.calls)
+        for call, offset in group.spans():
+            span = slice(offset, offset + len(call.txns))
+            records[call.index] = CallRecord(
+                method=group.atc.method_dict[offset + call.method_offset].name,
+                seconds=share,
+                fee=transaction_fees(txns[span]),
+                opcode_cost=sum(group.opcode_costs[span]) if group.opcode_costs else None,
+                box_refs=box_reference_count(txns[span]),
+                tx_id=group.atc.tx_ids[offset + call.method_offset],
+            )
+
+    @staticmethod
+    def _fail(calls: list[_Call], error: Exception, results: list[CallResult]) -> None:
+        for call in calls:
+            results[call.index].error = error
@@ -4,6 +4,8 @@ import os
 
 import algokit_utils
 
+from smart_contracts._runtime import telemetry
+
 # Ensure the parent directory is in sys.path so "artifacts" can be imported
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -13,32 +15,39 @@ logger = logging.getLogger(__name__)
 # define deployment behaviour based on supplied app spec
 def deploy() -> None:
     from artifacts.yield_router.yield_router_contract_client import HelloArgs, YieldRouterContractFactory
-    algorand = algokit_utils.AlgorandClient.from_environment()
+    algorand = telemetry.instrument(algokit_utils.AlgorandClient.from_environment())
     deployer_ = algorand.account.from_environment("DEPLOYER")
 
     factory = algorand.client.get_typed_app_factory(
         YieldRouterFactory, default_sender=deployer_.address
     )
 
-    app_client, result = factory.deploy(
-        on_update=algokit_utils.OnUpdate.AppendApp,
-        on_schema_break=algokit_utils.OnSchemaBreak.AppendApp,
+    app_client, result = telemetry.track_deploy(
+        lambda: factory.deploy(
+            on_update=algokit_utils.OnUpdate.AppendApp,
+            on_schema_break=algokit_utils.OnSchemaBreak.AppendApp,
+        )
     )
 
     if result.operation_performed in [
         algokit_utils.OperationPerformed.Create,
         algokit_utils.OperationPerformed.Replace,
     ]:
-        algorand.send.payment(
-            algokit_utils.PaymentParams(
-                amount=algokit_utils.AlgoAmount(algo=1),
-                sender=deployer_.address,
-                receiver=app_client.app_address,
-            )
+        telemetry.track_send(
+            "fund",
+            lambda: algorand.send.payment(
+                algokit_utils.PaymentParams(
+                    amount=algokit_utils.AlgoAmount(algo=1),
+                    sender=deployer_.address,
+                    receiver=app_client.app_address,
+                )
+            ),
         )
 
     name = "world"
-    response = app_client.send.hello(args=HelloArgs(name=name))
+    response = telemetry.track_send(
+        "hello", lambda: app_client.send.hello(args=HelloArgs(name=name))
+    )
     logger.info(
         f"Called hello on {app_client.app_name} ({app_client.app_id}) "
         f"with name={name}, received: {response.abi_return}"
@@ -0,0 +1,303 @@
+import asyncio
+from collections import Counter
+from typing import Any
+
+import pytest
+from algokit_utils import AlgorandClient, AppCallMethodCallParams, PaymentParams
+from algokit_utils.models.amount import AlgoAmount
+from algosdk import transaction
+from algosdk.abi import Method
+from algosdk.atomic_transaction_composer import ABI_RETURN_HASH
+from algosdk.error import AlgodHTTPError
+
+from smart_contracts._submit import BulkSubmitter, LocalAppCall, LocalNode
+from smart_contracts._submit.benchmark import APP_ID, UPDATE_PLAYER_STATS, leaderboard_handler
+from smart_contracts._submit.submitter import _ConfirmationWatcher
+
+ECHO = Method.from_signature("echo(uint64)uint64")
+STAKE = Method.from_signature("stake(uint64,pay)void")
+STAKE_PAIR = Method.from_signature("stake_pair(pay,pay)void")
+
+
+def echo_handler(txn: transaction.ApplicationCallTxn) -> LocalAppCall:
+    if txn.app_args[0] != ECHO.get_selector():
+        return LocalAppCall()
+    return LocalAppCall(logs=[ABI_RETURN_HASH + txn.app_args[1]])
+
+
+def _client(node: LocalNode) -> tuple[AlgorandClient, str]:
+    algorand = AlgorandClient.from_clients(algod=node)
+    return algorand, algorand.account.random().address
+
+
+def _stats_calls(sender: str, count: int) -> list[AppCallMethodCallParams]:
+    return [
+        AppCallMethodCallParams(
+            sender=sender,
+            app_id=APP_ID,
+            method=UPDATE_PLAYER_STATS,
+            args=[sender, i + 1, 0, 1],
+        )
+        for i in range(count)
+    ]
+
+
+def _group_ids(results: list[Any]) -> set[bytes]:
+    return {result.tx_info["txn"]["txn"]["grp"] for result in results if result.ok}
+
+
+def _payment(sender: str) -> PaymentParams:
+    return PaymentParams(sender=sender, receiver=sender, amount=AlgoAmount(micro_algo=1))
+
+
+def test_calls_are_packed_whole_into_groups() -> None:
+    algorand, sender = _client(LocalNode(echo_handler, round_time=None))
+    calls = [
+        *(
+            AppCallMethodCallParams(
+                sender=sender, app_id=APP_ID, method=STAKE, args=[i, _payment(sender)]
+            )
+            for i in range(7)
+        ),
+        AppCallMethodCallParams(
+            sender=sender,
+            app_id=APP_ID,
+            method=STAKE_PAIR,
+            args=[_payment(sender), _payment(sender)],
+        ),
+        *(
+            AppCallMethodCallParams(sender=sender, app_id=APP_ID, method=ECHO, args=[i])
+            for i in range(2)
+        ),
+    ]
+
+    results = BulkSubmitter(algorand).submit(calls)
+
+    # Seven two-transaction calls fill 14 slots; the three-transaction call doesn't fit
+    # beside them, so it starts the next group with the two single-transaction calls.
+    groups = [result.tx_info["txn"]["txn"]["grp"] for result in results]
+    assert all(result.ok for result in results)
+    assert groups == [groups[0]] * 7 + [groups[7]] * 3
+    assert groups[0] != groups[7]
+
+
+def test_box_references_are_populated() -> None:
+    algorand, sender = _client(LocalNode(leaderboard_handler(), round_time=None))
+
+    results = BulkSubmitter(algorand).submit(_stats_calls(sender, 40))
+
+    assert all(result.ok for result in results)
+    assert len(_group_ids(results)) == 3
+
+
+def test_rejected_calls_are_isolated_and_survivors_repacked() -> None:
+    algorand, sender = _client(LocalNode(leaderboard_handler(reject_every=8), round_time=None))
+
+    results = BulkSubmitter(algorand).submit(_stats_calls(sender, 32))
+
+    assert [result.index for result in results if not result.ok] == [7, 15, 23, 31]
+    assert all("assert failed" in str(result.error) for result in results if not result.ok)
+    assert len(_group_ids(results)) == 2
+
+
+class LookupCountingNode(LocalNode):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lookups: Counter[str] = Counter()
+
+    def _pending_info(self, tx_id: str) -> dict[str, Any]:
+        self.lookups[tx_id] += 1
+        return super()._pending_info(tx_id)
+
+
+def test_return_values_are_reported_per_call() -> None:
+    algorand, sender = _client(LocalNode(echo_handler, round_time=None))
+    calls = [
+        AppCallMethodCallParams(sender=sender, app_id=APP_ID, method=ECHO, args=[i * 7])
+        for i in range(20)
+    ]
+
+    results = BulkSubmitter(algorand).submit(calls)
+
+    assert [result.return_value for result in results] == [i * 7 for i in range(20)]
+    assert all(result.confirmed_round for result in results)
+    assert len({result.tx_id for result in results}) == 20
+
+
+def test_confirmed_group_is_not_looked_up_again() -> None:
+    node = LookupCountingNode(echo_handler, round_time=None)
+    algorand, sender = _client(node)
+    calls = [
+        AppCallMethodCallParams(sender=sender, app_id=APP_ID, method=ECHO, args=[i])
+        for i in range(16)
+    ]
+
+    results = BulkSubmitter(algorand).submit(calls)
+
+    # The watcher polls the first call before and after its round; the rest are looked up once.
+    assert node.lookups[results[0].tx_id] == 2
+    assert all(node.lookups[result.tx_id] == 1 for result in results[1:])
+
+
+class SlowSimulateNode(LocalNode):
+    """Each simulate takes five rounds."""
+
+    def _simulate(self, request: dict[str, Any]) -> dict[str, Any]:
+        self.advance(5)
+        return super()._simulate(request)
+
+
+def test_confirmations_after_idle_watcher_are_not_reported_as_expired() -> None:
+    algorand, sender = _client(SlowSimulateNode(leaderboard_handler(), round_time=None))
+
+    results = BulkSubmitter(algorand, max_in_flight=2, wave_size=16).submit(
+        _stats_calls(sender, 96)
+    )
+
+    assert [result.error for result in results if not result.ok] == []
+
+
+def test_sequential_submission_outlasting_the_validity_window() -> None:
+    algorand, sender = _client(LocalNode(leaderboard_handler(), round_time=None))
+
+    results = BulkSubmitter(algorand, max_group_size=1, max_in_flight=1).submit(
+        _stats_calls(sender, 15)
+    )
+
+    assert [result.error for result in results if not result.ok] == []
+
+
+def test_watcher_uses_current_round_after_idle() -> None:
+    node = LocalNode(echo_handler, round_time=None)
+    algorand, sender = _client(node)
+    built = algorand.create_transaction.app_call_method_call(
+        AppCallMethodCallParams(sender=sender, app_id=APP_ID, method=ECHO, args=[1])
+    )
+
+    async def run() -> dict[str, Any]:
+        watcher = _ConfirmationWatcher(node)
+        task = asyncio.create_task(watcher.run())
+        await asyncio.sleep(0)
+        node.advance(15)  # rounds pass while the watcher is idle
+        txn = built.transactions[0]
+        txn.first_valid_round = node.current_round()
+        txn.last_valid_round = txn.first_valid_round + 3
+        signer = algorand.account.get_signer(sender)
+        node.send_transactions(signer.sign_transactions([txn], [0]))
+        try:
+            return await watcher.watch(txn.get_txid(), txn.last_valid_round)
+        finally:
+            task.cancel()
+
+    assert asyncio.run(run())["confirmed-round"] > 0
+
+
+def test_local_node_rejects_transactions_outside_validity_window() -> None:
+    node = LocalNode(echo_handler, round_time=None)
+    algorand, sender = _client(node)
+    built = algorand.create_transaction.app_call_method_call(
+        AppCallMethodCallParams(
+            sender=sender, app_id=APP_ID, method=ECHO, args=[1], first_valid_round=1, last_valid_round=2
+        )
+    )
+    signed = algorand.account.get_signer(sender).sign_transactions(built.transactions, [0])
+    node.advance(5)
+
+    with pytest.raises(AlgodHTTPError, match="txn dead"):
+        node.send_transactions(signed)
+
+
+class CountingNode(LocalNode):
+    """Counts simulates and sends; each simulate can be made to take several rounds."""
+
+    def __init__(self, *args: Any, simulate_rounds: int = 0, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.simulate_rounds = simulate_rounds
+        self.simulates = 0
+        self.sends = 0
+
+    def _simulate(self, request: dict[str, Any]) -> dict[str, Any]:
+        self.simulates += 1
+        self.advance(self.simulate_rounds)
+        return super()._simulate(request)
+
+    def _send(self, data: bytes) -> dict[str, Any]:
+        self.sends += 1
+        return super()._send(data)
+
+
+def test_validity_window_starts_when_the_wave_is_signed() -> None:
+    # Three groups simulated at five rounds each outlast the ten-round window.
+    node = CountingNode(leaderboard_handler(), round_time=None, simulate_rounds=5)
+    algorand, sender = _client(node)
+
+    results = BulkSubmitter(algorand).submit(_stats_calls(sender, 48))
+
+    assert [result.error for result in results if not result.ok] == []
+    assert node.sends == 3
+
+
+class StallingNode(LocalNode):
+    """The first group sent arrives after its validity window has passed."""
+
+    stalled = False
+
+    def _send(self, data: bytes) -> dict[str, Any]:
+        if not self.stalled:
+            self.stalled = True
+            self.advance(20)
+        return super()._send(data)
+
+
+def test_dead_groups_are_restamped_and_resent() -> None:
+    algorand, sender = _client(StallingNode(echo_handler, round_time=None))
+    calls = [
+        AppCallMethodCallParams(sender=sender, app_id=APP_ID, method=ECHO, args=[i])
+        for i in range(20)
+    ]
+
+    results = BulkSubmitter(algorand).submit(calls)
+
+    assert [result.return_value for result in results] == list(range(20))
+
+
+def test_failed_groups_are_not_simulated_again() -> None:
+    node = CountingNode(leaderboard_handler(reject_every=16), round_time=None)
+    algorand, sender = _client(node)
+
+    results = BulkSubmitter(algorand).submit(_stats_calls(sender, 16))
+
+    assert [result.index for result in results if not result.ok] == [15]
+    # The full group, then one simulate per half down to the rejected call
+    # (2 + 2 + 2 + 2), then the 15 survivors repacked into one group.
+    assert node.simulates == 1 + 8 + 1
+    assert len(_group_ids(results)) == 1
+
+
+class DroppingNode(LocalNode):
+    """Accepts groups but never confirms them."""
+
+    def _send(self, data: bytes) -> dict[str, Any]:
+        return {"txId": ""}
+
+    def _pending_info(self, tx_id: str) -> dict[str, Any]:
+        return {"pool-error": "", "confirmed-round": 0}
+
+
+def test_unconfirmed_calls_fail_after_last_valid_round() -> None:
+    algorand, sender = _client(DroppingNode(echo_handler, round_time=None))
+    calls = [
+        AppCallMethodCallParams(
+            sender=sender, app_id=APP_ID, method=ECHO, args=[1], validity_window=3
+        )
+    ]
+
+    results = BulkSubmitter(algorand).submit(calls)
+
+    assert "not confirmed by its last valid round" in str(results[0].error)
+
+
+def test_max_group_size_is_validated() -> None:
+    algorand, _ = _client(LocalNode())
+    with pytest.raises(ValueError):
+        BulkSubmitter(algorand, max_group_size=17)
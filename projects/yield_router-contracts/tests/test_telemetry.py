@@ -0,0 +1,133 @@
+import time
+from typing import Any
+
+from algokit_utils import (
+    AlgoAmount,
+    AlgorandClient,
+    AppFactoryDeployResult,
+    OperationPerformed,
+    PaymentParams,
+    SendAppTransactionResult,
+)
+
+from smart_contracts._runtime import CallRecord, Telemetry
+from smart_contracts._submit import BulkSubmitter, LocalNode
+from smart_contracts._submit.benchmark import _calls, leaderboard_handler
+
+
+def test_group_latency_is_shared_by_its_calls() -> None:
+    algorand = AlgorandClient.from_clients(
+        algod=LocalNode(leaderboard_handler(), round_time=None)
+    )
+    sender = algorand.account.random().address
+    recorder = Telemetry(enabled=True)
+
+    started = time.perf_counter()
+    results = BulkSubmitter(algorand, telemetry=recorder).submit(_calls(sender, 32))
+    elapsed = time.perf_counter() - started
+
+    assert all(result.ok for result in results)
+    assert len(recorder.calls) == 32
+    # Each of the two groups is in flight for at most the whole run, and counted once.
+    assert sum(record.seconds for record in recorder.calls) <= 2 * elapsed
+    assert all(record.fee == 1000 and record.opcode_cost == 97 for record in recorder.calls)
+    # Group-level box references land on whichever transactions have room.
+    assert sum(record.box_refs for record in recorder.calls) == 32
+
+
+def test_prometheus_totals_are_exact() -> None:
+    recorder = Telemetry(enabled=True)
+    for _ in range(1197):
+        recorder.record_call(CallRecord("update_player_stats", 0.1, fee=1000, opcode_cost=1001))
+
+    text = recorder.to_prometheus()
+
+    assert 'yield_router_call_fees_microalgos_total{method="update_player_stats"} 1197000\n' in text
+    assert 'yield_router_call_opcode_cost_total{method="update_player_stats"} 1198197\n' in text
+    seconds = next(line for line in text.splitlines() if line.startswith("yield_router_call_seconds"))
+    assert float(seconds.split()[-1]) == sum([0.1] * 1197)
+
+
+class CountingNode(LocalNode):
+    simulates = 0
+
+    def _simulate(self, request: dict[str, Any]) -> dict[str, Any]:
+        self.simulates += 1
+        return super()._simulate(request)
+
+
+def test_opcode_cost_needs_no_extra_simulate() -> None:
+    counts = []
+    for enabled in (False, True):
+        node = CountingNode(leaderboard_handler(), round_time=None)
+        algorand = AlgorandClient.from_clients(algod=node)
+        recorder = Telemetry(enabled=enabled)
+        BulkSubmitter(algorand, telemetry=recorder).submit(
+            _calls(algorand.account.random().address, 32)
+        )
+        counts.append(node.simulates)
+
+    assert counts == [2, 2]
+    assert sum(record.opcode_cost or 0 for record in recorder.calls) == 32 * 97
+
+
+def test_track_send_reads_opcode_cost_from_instrumented_client() -> None:
+    recorder = Telemetry(enabled=True)
+    algorand = recorder.instrument(
+        AlgorandClient.from_clients(algod=LocalNode(leaderboard_handler(), round_time=None))
+    )
+    call = _calls(algorand.account.random().address, 1)[0]
+
+    recorder.track_send(call.method.name, lambda: algorand.send.app_call_method_call(call))
+
+    assert [(record.method, record.opcode_cost) for record in recorder.calls] == [
+        ("update_player_stats", 97)
+    ]
+
+
+def test_deploy_and_funding_are_recorded_as_calls() -> None:
+    recorder = Telemetry(enabled=True)
+    algorand = recorder.instrument(
+        AlgorandClient.from_clients(algod=LocalNode(leaderboard_handler(), round_time=None))
+    )
+    sender = algorand.account.random().address
+    create, delete = _calls(sender, 2)
+
+    def replace() -> tuple[None, AppFactoryDeployResult]:
+        # A replace sends the create and the delete of the old app as one group.
+        composer = algorand.new_group().add_app_call_method_call(create)
+        sent = composer.add_app_call_method_call(delete).send()
+        return None, AppFactoryDeployResult(
+            app=None,  # type: ignore[arg-type]
+            operation_performed=OperationPerformed.Replace,
+            create_result=SendAppTransactionResult.from_composer_result(sent, index=0),  # type: ignore[arg-type]
+            delete_result=SendAppTransactionResult.from_composer_result(sent, index=-1),
+        )
+
+    recorder.track_deploy(replace)
+    recorder.track_send(
+        "fund",
+        lambda: algorand.send.payment(
+            PaymentParams(sender=sender, receiver=sender, amount=AlgoAmount(algo=1))
+        ),
+    )
+
+    assert [(r.method, r.fee, r.opcode_cost) for r in recorder.calls] == [
+        ("create", 1000, 97),
+        ("delete", 1000, 97),
+        ("fund", 1000, None),
+    ]
+    assert recorder.calls[0].seconds == recorder.calls[1].seconds
+
+
+def test_repeated_steps_are_exported_as_a_counter() -> None:
+    recorder = Telemetry(enabled=True)
+    for _ in range(2):
+        with recorder.step("build", "yield_router"):
+            pass
+
+    text = recorder.to_prometheus()
+
+    assert "# TYPE yield_router_step_seconds_total counter\n" in text
+    sample = next(line for line in text.splitlines() if line.startswith("yield_router_step_seconds_total{"))
+    assert float(sample.split()[-1]) == sum(step.seconds for step in recorder.steps)